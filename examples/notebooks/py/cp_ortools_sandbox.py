@@ -105,20 +105,24 @@ get_plot(df)
 # In[ ]:
 
 
-from haversine import haversine, Unit
-
 def get_distance_matrix_from_dataframe(origins:list, dataframe:pd.DataFrame):
-    # select an origin node
-
-    distances = []
-    for coords0 in origins + list(zip(dataframe.latitude, dataframe.longitude)):
-        row = []
-        for coords1 in origins + list(zip(df.latitude, df.longitude)):
-            distance = haversine(coords0, coords1, unit=Unit.MILES)
-            row.append(distance)
-        distances.append(row)
-        
-    return distances
+    # stack origins and destinations into one (n, 2) radians array and
+    # compute all pairwise haversine distances with a single broadcasted
+    # expression instead of O(n^2) scalar haversine() calls.
+    coords = np.radians(np.vstack([
+        np.array(origins, dtype=float),
+        dataframe[['latitude', 'longitude']].to_numpy(dtype=float)
+    ]))
+
+    lat, lon = coords[:, 0], coords[:, 1]
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat/2)**2 \
+        + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlon/2)**2
+
+    r_miles = 3956
+
+    return 2 * r_miles * np.arcsin(np.sqrt(a))
 
 
 # ### Additional Processing
@@ -127,147 +131,36 @@ def get_distance_matrix_from_dataframe(origins:list, dataframe:pd.DataFrame):
 # Once we have these clusters we can allow for additional flexibility in the overall solution by tweaking the segmentation determined by DBSCAN. Setting a fixed constraint of X miles might work initially, but there could be return routes, connecting stops, etc. that make one-offs more appealing.
 # 
 # #### using clusters to reduce node pools
-# using dbscan we can select a chain-like cluster of nodes based on logic abstraction such as euclidean distance.
+# using dbscan backed by a ball tree with a haversine metric we can select chain-like clusters of nodes directly from radians coordinates, without building a dense distance matrix.
 
 # In[ ]:
 
 
-def get_closest_clusters(x:list, y:list, clusters:list):
-    """
-    Takes a list of x, a list of y, and a list of clusters to
-    process clusters for x, y without an assigned cluster.
-    To accomplish this the function calculates the euclidean
-    distance to every node with a cluster. It will then assign
-    the found node's cluster as its own.
-    
-    x: list-like of x coordinates
-    y: list-like of y coordinates
-    clusters: list-like of clusters assigned
-    
-    return list of clusters
-    """
-    c = list(clusters)
-    
-    positions = list(range(len(c)))
-    missing_clusters = [i for i in positions if pd.isnull(c[i])]
-    has_clusters = [i for i in positions if i not in missing_clusters]
-    
-    x_copy = np.array(x, dtype=float)
-    x_copy[missing_clusters] = np.inf
-
-    y_copy = np.array(y, dtype=float)
-    y_copy[missing_clusters] = np.inf
-    
-    for i in missing_clusters:
-        x_deltas = abs(x[i] - x_copy)
-        y_deltas = abs(y[i] - y_copy)
-        deltas = x_deltas + y_deltas
-        
-        c[i] = c[np.argmin(deltas)]
-    
-    return c
-
-def test_get_closest_clusters():
-    old_clusters = [1, 2, 3, None]
-    new_clusters = get_closest_clusters([1, 2, 3, 4], [1, 2, 3, 4], old_clusters)
-    
-    assert len(old_clusters) == len(new_clusters)
-    assert old_clusters != new_clusters
-    assert new_clusters[-1] == 3 #hardcoded
-
-test_get_closest_clusters()
-
-
-# In[ ]:
-
-
-class DBSCAN:
-    def __init__(self, x, y, epsilon=0.5, minpts=2, viz=None):
-        self.epsilon = epsilon
-        self.minpts = minpts
-        self.viz = viz
-
-    def to_dict(self):
-        _dict = {'epsilon': self.epsilon, 'minpts': self.minpts}
-        try:
-            _dict['n X'] = len(self.X)
-        except:
-            logging.warning('X has not been set.')
-        return _dict
-
-    def fit(self, x, y):
-        self.X = list(zip(x, y))
-        self.clusters = np.zeros(len(self.X), dtype=np.int32)
-        if self.viz:
-            self.viz.x = x
-            self.viz.y = y
-            self.viz.update(self.clusters)
-
-    @staticmethod
-    def get_neighbors(X, i, epsilon):
-        neighbors = []
-        for j in range(0, len(X)):
-            a = np.array(X[i])
-            b = np.array(X[j])
-            if np.linalg.norm(a-b) < epsilon:
-                neighbors.append(j)
-        return neighbors
-
-    def build_cluster(self, i, neighbors, cluster):
-        self.clusters[i] = cluster
-        for j in neighbors:
-            if self.clusters[j] == -1:
-                self.clusters[j] = cluster
-            elif self.clusters[j] == 0:
-                self.clusters[j] = cluster
-                points = self.get_neighbors(self.X, j, self.epsilon)
-                if len(points) >= self.minpts:
-                    neighbors += points
-
-    def cluster(self, x=None, y=None):
-        if x is None or y is None:
-            X = self.X
-        else:
-            X = list(zip(x, y))
-
-        cluster = 0
-        for i in range(0, len(X)):
-            if not self.clusters[i] == 0:
-                continue
-            points = self.get_neighbors(X, i, self.epsilon)
-            if len(points) < self.minpts:
-                self.clusters[i] = -1
-            else:
-                cluster += 1
-                self.build_cluster(i, points, cluster)
-            if self.viz:
-                self.viz.update(self.clusters)
+from sklearn.cluster import DBSCAN
 
 def get_clusters(dataframe:pd.DataFrame):
     """
       weight,pallets,zipcode,latitude,longitude
       18893,24,46168,39.6893,-86.3919
       19599,25,46168,39.6893,-86.3919
-    
+
     return df with clusters col
     """
-    epsilon = 0.79585 # approximate degree delta for 50 miles
-    minpts = 2 # at least cluster 2
-
-    # simplify euclidean distance calculation by projecting to positive vals
-    x = dataframe.latitude.values + 90
-    y = dataframe.longitude.values + 180
-
-    dbscan = DBSCAN(epsilon, minpts)
-    dbscan.fit(x, y)
-    dbscan.cluster()
-    
-    # add those without an assigned cluster
-    # to their closest cluster
-    clusters = [c if int(c) >= 0 else None for c in dbscan.clusters]
-    clusters = get_closest_clusters(x, y, clusters)
-    
-    return clusters
+    epsilon_miles = 50
+    earth_radius_miles = 3956
+    min_samples = 1 # every node joins its nearest chain (no noise label)
+
+    # the ball tree haversine query runs in O(n log n) with O(n) memory,
+    # so no dense n^2 matrix (or degree-delta projection) is needed and
+    # no separate closest-cluster expansion pass is required
+    coords = np.radians(dataframe[['latitude', 'longitude']].to_numpy())
+    dbscan = DBSCAN(
+        eps=epsilon_miles / earth_radius_miles,
+        min_samples=min_samples,
+        algorithm='ball_tree',
+        metric='haversine').fit(coords)
+
+    return dbscan.labels_
 
 df['cluster'] = get_clusters(df)
 df.cluster = df.cluster.astype(str)
@@ -299,37 +192,97 @@ from ortools.constraint_solver import pywrapcp
 def get_manager(distances:list, vehicles:list, depot_index:int): 
     return pywrapcp.RoutingIndexManager(len(distances), len(vehicles), 0)
 
-def get_model(manager):
-    return pywrapcp.RoutingModel(manager)
+def get_model(manager, n_nodes:int):
+    # the fleet is homogeneous (same capacity, same cost callback), so let
+    # ortools collapse the symmetric vehicles and memoize callback results
+    # instead of re-entering python for arcs it has already evaluated
+    model_parameters = pywrapcp.DefaultRoutingModelParameters()
+    model_parameters.reduce_vehicle_cost_model = True
+    model_parameters.max_callback_cache_size = n_nodes * n_nodes
+
+    return pywrapcp.RoutingModel(manager, model_parameters)
+
+def get_savings_routes(distances:np.ndarray, demand:np.ndarray, capacity:int):
+    """greedy clarke-wright savings construction. merges single-stop routes
+    at their endpoints in order of savings d(0,i) + d(0,j) - d(i,j) while
+    respecting vehicle capacity. returns routes as lists of destination
+    nodes (depot excluded) ready for warm-starting the solver."""
+    n = len(distances)
+    depot_distances = distances[0].astype(np.int64)
+    savings = depot_distances[:, None] + depot_distances[None, :] - distances
+    i_pairs, j_pairs = np.triu_indices(n, k=1)
+    destinations_only = i_pairs > 0
+    i_pairs, j_pairs = i_pairs[destinations_only], j_pairs[destinations_only]
+    by_savings = np.argsort(savings[i_pairs, j_pairs])[::-1]
+
+    route_of = {node: node for node in range(1, n)}
+    routes = {node: [node] for node in range(1, n)}
+    loads = {node: int(demand[node]) for node in range(1, n)}
+
+    for k in by_savings:
+        i, j = int(i_pairs[k]), int(j_pairs[k])
+        route_i, route_j = route_of[i], route_of[j]
+        if route_i == route_j:
+            continue
+        # only merge tail-to-head so intra-route sequences stay intact
+        if routes[route_i][-1] != i or routes[route_j][0] != j:
+            if routes[route_j][-1] == j and routes[route_i][0] == i:
+                route_i, route_j = route_j, route_i
+            else:
+                continue
+        if loads[route_i] + loads[route_j] > capacity:
+            continue
+        routes[route_i].extend(routes[route_j])
+        loads[route_i] += loads[route_j]
+        for node in routes[route_j]:
+            route_of[node] = route_i
+        del routes[route_j], loads[route_j]
+
+    return list(routes.values())
 
 # config for optimization search
 def get_search_params(max_solve_seconds:int=30):
+    # SAVINGS builds a much better first cvrp tour than PATH_CHEAPEST_ARC,
+    # and guided local search spends the remaining budget escaping the
+    # local minima the default descent gets stuck in
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-    search_parameters.first_solution_strategy =         routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    search_parameters.first_solution_strategy =         routing_enums_pb2.FirstSolutionStrategy.SAVINGS
+    search_parameters.local_search_metaheuristic =         routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
     search_parameters.time_limit.seconds = max_solve_seconds
-    
+    search_parameters.log_search = False
+
     return search_parameters
 
 class OrToolsPipe:
     def __init__(self, manager, model):
         self.manager = manager
         self.model = model
+        # the index->node mapping is static per solve, so cache it in one
+        # lookup array and spare the callbacks two manager.IndexToNode
+        # round trips per arc evaluation
+        self.node_of = np.array([manager.IndexToNode(i)
+            for i in range(manager.GetNumberOfIndices())], dtype=np.int32)
         self.distances = None
         self.vehicles = None
         self.demand = None
         
-    def distance_callback(self, i:int, j:int):
-        """index of from (i) and to (j)"""
-        node_i = self.manager.IndexToNode(i)
-        node_j = self.manager.IndexToNode(j)
-
-        return self.distances[node_i][node_j]
-    
     def set_distance_callback(self):
+        # ortools evaluates arcs millions of times inside local search;
+        # bind everything the callback touches to locals over one flat
+        # contiguous buffer so each call is a single index computation
+        # with no attribute lookups or 2d-index tuple handling
+        node_of = self.node_of
+        n = len(self.distances)
+        flat_distances = np.ascontiguousarray(self.distances).reshape(-1)
+
+        def distance_callback(i:int, j:int):
+            """index of from (i) and to (j)"""
+            return int(flat_distances[node_of[i] * n + node_of[j]])
+
         self.model.SetArcCostEvaluatorOfAllVehicles(
-            self.model.RegisterTransitCallback(self.distance_callback)
+            self.model.RegisterTransitCallback(distance_callback)
         )
-        
+
         return self
     
     def add_distances(self, distances):
@@ -338,97 +291,171 @@ class OrToolsPipe:
         
         return self
     
-    def demand_callback(self, i:int):
-        """capacity constraint"""
-        node = self.manager.IndexToNode(i)
-
-        return self.demand[node]
-    
     def set_demand_callback(self):
+        node_of = self.node_of
+        # indexing an ndarray returns a boxed numpy scalar per call; a
+        # tuple of plain ints keeps the unary callback allocation-free
+        demand = tuple(int(units) for units in self.demand)
+
+        def demand_callback(i:int):
+            """capacity constraint"""
+            return demand[node_of[i]]
+
         # add demand constraint using vehicles
         self.model.AddDimensionWithVehicleCapacity(
             # function which return the load at each location (cf. cvrp.py example)
-            self.model.RegisterUnaryTransitCallback(self.demand_callback),
+            self.model.RegisterUnaryTransitCallback(demand_callback),
             0, # null capacity slack
-            np.array([cap for cap in self.vehicles]), # vehicle maximum capacity
+            self.vehicles, # vehicle maximum capacity
             True, # start cumul to zero
             'Capacity'
         )
         
         return self
     
-    def add_vehicles(self, vehicles:list):
+    def add_vehicles(self, vehicles:np.ndarray):
         self.vehicles = vehicles
-        if self.demand: 
+        if self.demand is not None:
             return self.set_demand_callback()
-        
+
         return self
-    
-    def add_demand(self, demand:list):
+
+    def add_demand(self, demand:np.ndarray):
         self.demand = demand
-        if self.vehicles: 
+        if self.vehicles is not None:
             return self.set_demand_callback()
-        
+
         return self
     
     def get_solution(self, assignment):
-        total_distance = 0
-        total_load = 0
-        solution = []
-        for vehicle in range(len(self.vehicles)):
+        """structure-of-arrays solution: stops, stop_loads and
+        stop_distances concatenated across vehicles, with a csr-like
+        veh_starts offsets array marking each vehicle's segment. scoring
+        then runs as vectorized reductions instead of dict/list walks."""
+        n_vehicles = len(self.vehicles)
+        n_nodes = len(self.demand)
+
+        # every node appears once plus a depot start & appended depot
+        # return per vehicle
+        upper_bound = n_nodes + 2 * n_vehicles
+        stops = np.empty(upper_bound, dtype=np.int32)
+        stop_loads = np.empty(upper_bound, dtype=np.int32)
+        stop_distances = np.empty(upper_bound, dtype=np.int64)
+        veh_starts = np.empty(n_vehicles + 1, dtype=np.int64)
+
+        position = 0
+        for vehicle in range(n_vehicles):
+            veh_starts[vehicle] = position
             i = self.model.Start(vehicle)
-            info = {'vehicle': vehicle, 'stops': list(), 'stop_distances': [0],
-                    'stop_loads': list()}
+            stop_distances[position] = 0
 
             while not self.model.IsEnd(i):
                 node = self.manager.IndexToNode(i)
-                info['stops'].append(node)
-                info['stop_loads'].append(self.demand[node])
+                stops[position] = node
+                stop_loads[position] = self.demand[node]
 
                 previous_i = int(i)
                 i = assignment.Value(self.model.NextVar(i))
-                info['stop_distances'].append(self.model.GetArcCostForVehicle(previous_i, i, vehicle))
+                stop_distances[position + 1] = self.model.GetArcCostForVehicle(previous_i, i, vehicle)
+                position += 1
 
             # add return to depot to align with solution data
-            info['stops'].append(0)
-            info['stop_loads'].append(0)
-            solution.append(info)
-        
-        return solution
-            
-    def run(self, search_params):
+            stops[position] = 0
+            stop_loads[position] = 0
+            position += 1
+        veh_starts[n_vehicles] = position
+
+        return {'stops': stops[:position],
+                'stop_loads': stop_loads[:position],
+                'stop_distances': stop_distances[:position],
+                'veh_starts': veh_starts}
+
+    def run(self, search_params, initial_routes:list=None):
+        if initial_routes is not None:
+            # warm-starting skips the first-solution phase so the whole
+            # budget goes to improving a feasible solution
+            self.model.CloseModelWithParameters(search_params)
+            initial = self.model.ReadAssignmentFromRoutes(initial_routes, True)
+            if initial is not None:
+                return self.model.SolveFromAssignmentWithParameters(
+                    initial, search_params)
+
         return self.model.SolveWithParameters(search_params)
-    
+
+def get_vehicle_slices(solution:dict):
+    """yield (stops, stop_distances, stop_loads) array views per vehicle
+    from the structure-of-arrays solution"""
+    starts = solution['veh_starts']
+    for vehicle in range(len(starts) - 1):
+        begin, end = starts[vehicle], starts[vehicle + 1]
+        yield (solution['stops'][begin:end],
+               solution['stop_distances'][begin:end],
+               solution['stop_loads'][begin:end])
+
 def get_solution_from_dataframe(dataframe:pd.DataFrame):
     # TODO: abstraction & testing
     origins = [(41.4191, -87.7748)] # assumed depot location for one-depot solutions
     distances = get_distance_matrix_from_dataframe(origins, dataframe)
     assert len(distances) == len(origins) + len(dataframe)
-    
-    vehicles = [26 for i in range(len(distances[1:]))]
-    demand = np.insert(dataframe.pallets.values, 0, 0) # using pallets & adding 0 for the depot
+
+    # ortools wants integer arc costs; scale to hundredths of a mile and
+    # keep the matrix as one contiguous integer ndarray so the callback
+    # does a single lookup with no float->int cast per arc evaluation.
+    # int32 comfortably holds scaled haversine miles and halves the
+    # matrix footprint the solver's random access pattern scans
+    distances = np.rint(distances * 100).astype(np.int32)
+
+    demand = np.insert(dataframe.pallets.to_numpy(np.int32), 0, 0) # using pallets & adding 0 for the depot
+
+    max_vehicle_capacity = 26
     max_solve_seconds = 30
     depot_index = 0
-    
-    manager = get_manager(distances, vehicles, depot_index)
-    model = get_model(manager)
-    pipe = OrToolsPipe(manager, model)
+
     search_params = get_search_params()
-    assignment = pipe.add_distances(distances)        .add_vehicles(vehicles)        .add_demand(demand)        .run(search_params)
+    initial_routes = get_savings_routes(distances, demand, max_vehicle_capacity)
+
+    # a truck per stop makes the solver carry state for every vehicle and
+    # branch over symmetric fleet choices; bound the fleet by total demand
+    # plus some slack instead, but never below the savings route count or
+    # the warm-start assignment cannot load. int64 capacities match what
+    # ortools stores internally
+    n_vehicles = max(
+        int(np.ceil(demand.sum() / max_vehicle_capacity)) + 5,
+        len(initial_routes))
+    vehicles = np.full(n_vehicles, max_vehicle_capacity, dtype=np.int64)
+
+    def solve(vehicles):
+        manager = get_manager(distances, vehicles, depot_index)
+        model = get_model(manager, len(distances))
+        pipe = OrToolsPipe(manager, model)
+        assignment = pipe.add_distances(distances)            .add_vehicles(vehicles)            .add_demand(demand)            .run(search_params, initial_routes)
+
+        return pipe, assignment
+
+    pipe, assignment = solve(vehicles)
+    while assignment is None:
+        # per-stop demand makes the fit a bin-packing problem, so the
+        # demand-based fleet bound can be infeasible; double and retry
+        vehicles = np.full(len(vehicles) * 2, max_vehicle_capacity,
+            dtype=np.int64)
+        pipe, assignment = solve(vehicles)
     
     return pipe.get_solution(assignment)
         
 basic_solution = get_solution_from_dataframe(df)
 
-assert len(basic_solution) > 0 # TODO: create better solution testing
+assert len(basic_solution['stops']) > 0 # TODO: create better solution testing
 
-vehicleindex_w_moststops = np.argmax([len(v['stops']) for v in basic_solution])
-vehicles_w_loads = [v for v in basic_solution if sum(v['stop_loads']) > 0]
-print('test>> total vehicles: %s' % len(basic_solution))
+starts = basic_solution['veh_starts']
+vehicleindex_w_moststops = int(np.argmax(np.diff(starts)))
+vehicles_w_loads = [stops for stops, dists, loads
+                    in get_vehicle_slices(basic_solution) if loads.sum() > 0]
+print('test>> total vehicles: %s' % (len(starts) - 1))
 print('test>> total vehicles w loads: %s' % len(vehicles_w_loads))
 #print('total load: %s' % solution[-1])
 #print('total input load: %s' % demand.sum())
-print('test>> max stop sequence: %s' % basic_solution[vehicleindex_w_moststops]['stops'])
+print('test>> max stop sequence: %s' % basic_solution['stops'][
+    starts[vehicleindex_w_moststops]:starts[vehicleindex_w_moststops + 1]])
 
 
 # ## Post-processing
@@ -446,11 +473,13 @@ class CheckStage: # TODO: figure out best way to abstract checks & tests here
     
     # scoring theoretical
     # average capacity utilization of vehicles
-    def get_load_factor(self, solution:list=None):
+    def get_load_factor(self, solution:dict=None):
         if solution is None: solution = self.solution
-            
-        total_loads = sum([sum(s['stop_loads']) for s in solution])
-        total_utilized_vehicles = len([s for s in solution if len(s['stops'][1:-1]) > 0])
+
+        starts = solution['veh_starts']
+        total_loads = solution['stop_loads'].sum()
+        # segments are depot + stops + return, so utilized means > 2 entries
+        total_utilized_vehicles = np.count_nonzero(np.diff(starts) > 2)
 
         return total_loads / total_utilized_vehicles
 
@@ -462,11 +491,14 @@ class CheckStage: # TODO: figure out best way to abstract checks & tests here
     # average distance traveled per vehicle
     # NOTE: excluding distances returning to depot for now
     # need to refactor for this.
-    def get_distance_factor(self, solution:list=None):
+    def get_distance_factor(self, solution:dict=None):
         if solution is None: solution = self.solution
-            
-        total_distances = sum([sum(s['stop_distances'][:-1]) for s in solution])
-        total_vehicles = len([s for s in solution if len(s['stops'][1:-1]) > 0])
+
+        starts = solution['veh_starts']
+        dists = solution['stop_distances']
+        # one reduction pass, dropping each segment's final arc
+        total_distances = dists.sum() - dists[starts[1:] - 1].sum()
+        total_vehicles = np.count_nonzero(np.diff(starts) > 2)
 
         return total_distances / total_vehicles
 
@@ -475,11 +507,13 @@ class CheckStage: # TODO: figure out best way to abstract checks & tests here
             
         return dataframe.groupby('vehicle').stop_distance.sum().mean()
 
-    def get_travel_factor(self, solution:list=None):
+    def get_travel_factor(self, solution:dict=None):
         if solution is None: solution = self.solution
-            
-        total_distances = sum([sum(s['stop_distances'][:-1]) for s in solution])
-        total_stops = sum([len(s['stops'][1:-1]) for s in solution])
+
+        starts = solution['veh_starts']
+        dists = solution['stop_distances']
+        total_distances = dists.sum() - dists[starts[1:] - 1].sum()
+        total_stops = (np.diff(starts) - 2).sum()
 
         return total_distances / total_stops
     
@@ -491,11 +525,12 @@ class CheckStage: # TODO: figure out best way to abstract checks & tests here
 
     # ratio of one-stop routes to multi-stop 
     # (assumption is that implementation is looking for multi-stops)
-    def get_multistop_factor(self, solution:list=None):
+    def get_multistop_factor(self, solution:dict=None):
         if solution is None: solution = self.solution
-        
-        total_multistop_vehicles = len([s for s in solution if len(s['stops'][1:-1]) > 1])
-        total_vehicles = len([s for s in solution if len(s['stops'][1:-1]) > 0])
+
+        stop_counts = np.diff(solution['veh_starts']) - 2
+        total_multistop_vehicles = np.count_nonzero(stop_counts > 1)
+        total_vehicles = np.count_nonzero(stop_counts > 0)
 
         return total_multistop_vehicles / total_vehicles
         
@@ -506,7 +541,7 @@ class CheckStage: # TODO: figure out best way to abstract checks & tests here
         
         return (vehicles.size() > 1).sum() / len(vehicles)
     
-    def get_satisfaction_factor(self, solution:list=None):
+    def get_satisfaction_factor(self, solution:dict=None):
         if solution is None: solution = self.solution
         
         return None # TODO: can't pull from solution alone
@@ -551,17 +586,32 @@ class CheckStage: # TODO: figure out best way to abstract checks & tests here
         # moving on for now.
         
 
-def process_solution_to_dataframe(solution:list, dataframe:pd.DataFrame):
-    for v in solution:
+def process_solution_to_dataframe(solution:dict, dataframe:pd.DataFrame):
+    # scatter every vehicle's stop data into preallocated full-length
+    # arrays and assign them as columns once, rather than paying pandas
+    # .loc setitem alignment four times per vehicle
+    n = len(dataframe)
+    vehicle_col = np.full(n, -1, dtype=np.int32)
+    sequence_col = np.empty(n, dtype=np.int32)
+    distance_col = np.empty(n, dtype=np.float64)
+    load_col = np.empty(n, dtype=np.int32)
+
+    for vehicle, (stops, stop_distances, stop_loads) in \
+        enumerate(get_vehicle_slices(solution)):
         # accounting for insert of origin to matrix input
-        stops = list(np.array(v['stops'][1:-1]) - 1)
+        positions = stops[1:-1] - 1
 
-        dataframe.loc[stops, 'vehicle'] = str(v['vehicle'])
-        dataframe.loc[stops, 'sequence'] = list(range(len(stops))) # assumes order matches
-        dataframe.loc[stops, 'stop_distance'] = v['stop_distances'][1:-1]
-        dataframe.loc[stops, 'stop_load'] = v['stop_loads'][1:-1]
-    
-    return dataframe        
+        vehicle_col[positions] = vehicle
+        sequence_col[positions] = np.arange(len(positions)) # assumes order matches
+        distance_col[positions] = stop_distances[1:-1]
+        load_col[positions] = stop_loads[1:-1]
+
+    dataframe['vehicle'] = vehicle_col.astype(str)
+    dataframe['sequence'] = sequence_col
+    dataframe['stop_distance'] = distance_col
+    dataframe['stop_load'] = load_col
+
+    return dataframe
 
 basic_df = process_solution_to_dataframe(basic_solution, df)
 
@@ -2,7 +2,7 @@ from math import radians, cos, sin, asin, sqrt
 import numpy as np
 import random
 
-from haversine import haversine, Unit
+from sklearn.metrics.pairwise import haversine_distances
 
 def pyords_haversine(lat1: float, lon1: float, lat2: float, lon2: float,
               unit: str='mi'):
@@ -76,16 +76,13 @@ def pyords_haversine_vectorized(lat1: list, lat2: list, lon1: list, lon2: list,
     return c * r
 
 def create_haversine_matrix(origins:list, latitudes:list, longitudes:list):
-    distances = []
+    # one pairwise C-level call over the stacked radians coordinates
+    # instead of O(n^2) scalar haversine() calls
     destinations = list(zip(latitudes, longitudes))
-    for coords0 in origins + destinations:
-        row = []
-        for coords1 in origins + destinations:
-            distance = haversine(coords0, coords1, unit=Unit.MILES)
-            row.append(distance)
-        distances.append(row)
-        
-    return distances
+    coords = np.radians(np.array(list(origins) + destinations, dtype=float))
+    distances = haversine_distances(coords) * 3956 # earth radius in miles
+
+    return [list(row) for row in distances]
 
 
 def pyords_haversine_distance_matrix(lats, lons, unit: str='mi'):
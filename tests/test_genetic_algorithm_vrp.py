@@ -6,7 +6,6 @@ import matplotlib.pylab as lab
 import pandas as pd
 import numpy as np
 from os import path
-from haversine import haversine, Unit
 import random
 import logging
 
@@ -34,65 +33,73 @@ zip_lookup = geo_lookup.reset_index()[['zipcode', 'position']]
 position_dict = dict(zip(geo_lookup.zipcode, geo_lookup.position))
 demand_data['zip_i'] = demand_data.zipcode.replace(position_dict)
 
-# create corresponding distance matrix
-distance_matrix = []
-indicies = geo_lookup.index.tolist()
-for i in indicies:
-    o_lat = geo_lookup.latitude.loc[i]
-    o_lon = geo_lookup.longitude.loc[i]
-    tmp_dist_li = []
-    for j in indicies:
-        d_lat = geo_lookup.latitude.loc[j]
-        d_lon = geo_lookup.longitude.loc[j]
-        dist = haversine((o_lat, o_lon), (d_lat, d_lon), Unit.MILES)
-        tmp_dist_li.append(dist*1.17) # assumed circuity
-    distance_matrix.append(tmp_dist_li)
-environment_dict = {'distance_matrix': distance_matrix}
-
-def fitness_func(individual, environment):
-    """Return a fitness score for an individual. Lower scores rank
-    higher."""
-
-    def decode():
-        """return individual represented with demand_data"""
-        data = environment.df.copy()
-        data['chromosomes'] = individual
-        return data
-
-    decoded = decode()
+# create corresponding distance matrix with one broadcasted haversine
+# expression over the unique-zip coordinates instead of n^2 scalar
+# haversine() calls through pandas .loc access
+lats = np.radians(geo_lookup.latitude.to_numpy())
+lons = np.radians(geo_lookup.longitude.to_numpy())
+dlat = lats[:, None] - lats[None, :]
+dlon = lons[:, None] - lons[None, :]
+a = np.sin(dlat/2)**2 \
+    + np.cos(lats[:, None]) * np.cos(lats[None, :]) * np.sin(dlon/2)**2
+distance_matrix = 2 * 3956 * np.arcsin(np.sqrt(a)) * 1.17 # assumed circuity
+# float32 keeps plenty of precision for scoring miles and halves the
+# matrix memory the fitness lookups touch
+environment_dict = {'distance_matrix': distance_matrix.astype(np.float32)}
+
+def make_fitness_func(data:pd.DataFrame, distance_matrix:np.ndarray):
+    """Specialize a fitness function for one fixed problem. Everything
+    constant across evaluations (capacity limits, per-stop arrays and the
+    distance matrix) is bound once here so each call only does work
+    proportional to the individual."""
 
     # evaluate routes' total weight, total pallets, and total distance.
     max_weight = 45000
     max_pallets = 25
     max_distance = 50*2 # represent a total day of driving based off of 2 stops
 
-    # tally penalties (dif from maxing out capacity + minimizing distance)
-    weight_penalty = (
-        max_weight - decoded.groupby('chromosomes')['weight'].sum()
-        ).abs().sum()
-
-    pallet_penalty = (
-        max_pallets - decoded.groupby('chromosomes')['pallets'].sum()
-        ).abs().sum()
-
-    def get_distance(c1, c2, i1, i2):
-        if i1 < 0:
-            return np.nan
-        if c1 != c2:
-            return np.nan
-        return environment._dict['distance_matrix'][int(i1)][int(i2)]
-
-    def get_distance_penalty():
-        decoded.sort_values(by='chromosomes', inplace=True)
-        decoded['prev_i'] = decoded.zip_i.shift().fillna(-1).astype(int)
-        decoded['prev_chromosomes'] = decoded.chromosomes.shift()
-        decoded['distance'] = decoded.apply(lambda x: get_distance(
-            x.prev_chromosomes, x.chromosomes, x.prev_i, x.zip_i), axis=1)
-        return decoded.distance.sum()
-
-    distance_penalty = get_distance_penalty()
-    total_penalty = weight_penalty + pallet_penalty + distance_penalty
-    return total_penalty
+    # constant per-stop arrays for the bincount-based penalty sums
+    weights = data.weight.to_numpy(dtype=np.float64)
+    pallets = data.pallets.to_numpy(dtype=np.float64)
+    zip_positions = data.zip_i.to_numpy(dtype=np.int64)
+    matrix = np.asarray(distance_matrix, dtype=np.float32)
+
+    def fitness_func(individual, environment):
+        """Return a fitness score for an individual. Lower scores rank
+        higher."""
+
+        # tally penalties (dif from maxing out capacity + minimizing distance)
+        # sum weight/pallets per route with bincount on the integer chromosome
+        # instead of building two groupby hash tables on the same key
+        chromosomes = np.asarray(individual, dtype=np.int64)
+        nbins = chromosomes.max() + 1
+        used = np.bincount(chromosomes, minlength=nbins) > 0
+
+        route_weights = np.bincount(chromosomes, weights=weights,
+            minlength=nbins)
+        weight_penalty = np.abs(max_weight - route_weights[used]).sum()
+
+        route_pallets = np.bincount(chromosomes, weights=pallets,
+            minlength=nbins)
+        pallet_penalty = np.abs(max_pallets - route_pallets[used]).sum()
+
+        def get_distance_penalty():
+            """sum matrix distances between consecutive stops that share a
+            chromosome (route) using one vectorized lookup. sorting one
+            int array with argsort beats reshuffling a whole dataframe
+            with sort_values."""
+            order = np.argsort(chromosomes, kind='stable')
+            routes = chromosomes[order]
+            positions = zip_positions[order]
+            same_route = routes[1:] == routes[:-1]
+            return matrix[positions[:-1][same_route],
+                positions[1:][same_route]].sum()
+
+        distance_penalty = get_distance_penalty()
+        total_penalty = weight_penalty + pallet_penalty + distance_penalty
+        return total_penalty
+
+    return fitness_func
 
 def test_algorithm():
     # visualization for fitness algo performance
@@ -104,7 +111,8 @@ def test_algorithm():
     algorithm = BasicGeneticAlgorithm(
         first_individual=initial_route_ids,
         environment=environment,
-        fitness_func=fitness_func,
+        fitness_func=make_fitness_func(demand_data,
+            environment_dict['distance_matrix']),
         n_generations=n_generations,
         population_size=population_size,
         mutation_rate=0.07,